@@ -1,14 +1,24 @@
 import os
+import array
 import shutil
 import threading
-import queue
+import collections
 import time
+import secrets
+import shlex
 import subprocess
-from datetime import datetime
+import tarfile
+import concurrent.futures
+from datetime import datetime, timedelta
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 
+try:
+    import numpy
+except ImportError:  # optional; only speeds up date filtering on huge trees
+    numpy = None
+
 DEFAULT_SUBFOLDERS = [
     "WhatsApp Images",
     "WhatsApp Video",
@@ -20,6 +30,21 @@ DEFAULT_SUBFOLDERS = [
 
 DATE_FMT = "%Y-%m-%d"
 
+# Workers batch scanned/progress events in groups of this size so the UI
+# queue sees a few dozen updates per drain instead of two per file.
+SCAN_FLUSH_EVERY = 64
+
+# Tk Text slows down badly past a few MB, so the log keeps only the most
+# recent lines; per-file lines are opt-in via the Verbose checkbox.
+MAX_LOG_LINES = 5000
+EXPORT_SUMMARY_EVERY = 1000
+
+# Matched files from one remote directory are pulled as a single tar
+# stream over `adb exec-out`; batches are bounded so one stream failure
+# never costs too much re-work.
+TAR_BATCH_MAX_FILES = 256
+TAR_BATCH_MAX_BYTES = 64 * 1024 * 1024
+
 
 def parse_yyyy_mm_dd(s: str) -> datetime:
     """Parse strict YYYY-MM-DD date."""
@@ -33,22 +58,76 @@ def detect_media_root(source_root: str) -> str:
     return source_root
 
 
+def scandir_files(path: str):
+    """Recursively yield os.DirEntry objects for regular files under path.
+
+    Unlike os.walk + getmtime, the DirEntry stat result is cached, so a
+    later date filter costs one stat per file instead of two or three.
+    """
+    try:
+        it = os.scandir(path)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from scandir_files(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+            except OSError:
+                continue
+
+
 def ensure_dir(path: str) -> None:
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    os.makedirs(path, exist_ok=True)
 
 
 def unique_destination_path(dst_path: str) -> str:
-    if not os.path.exists(dst_path):
-        return dst_path
-
+    """Atomically claim a destination path, suffixing on collision.
+
+    The chosen path is created as an empty placeholder file with
+    O_CREAT|O_EXCL, so concurrent copies can never be handed the same
+    name and the common no-collision case costs a single syscall.
+    Callers overwrite the placeholder (copyfile / adb pull truncate it).
+    The parent directory must already exist.
+    """
     base, ext = os.path.splitext(dst_path)
-    i = 1
+    candidate = dst_path
     while True:
-        candidate = f"{base}__dup{i}{ext}"
-        if not os.path.exists(candidate):
-            return candidate
-        i += 1
+        try:
+            fd = os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            candidate = f"{base}__dup{secrets.token_hex(3)}{ext}"
+            continue
+        os.close(fd)
+        return candidate
+
+
+def copy_local_file(src_file: str, dst_file: str, mtime_ts: float, mode: str) -> None:
+    if mode == "copy":
+        # copyfile uses the in-kernel fast path (sendfile / CopyFileW) and
+        # releases the GIL; we only need the mtime back, not the full
+        # copystat metadata pass copy2 would do.
+        shutil.copyfile(src_file, dst_file)
+        os.utime(dst_file, (mtime_ts, mtime_ts))
+    else:
+        try:
+            # Atomic overwrite of the claimed placeholder on both platforms;
+            # shutil.move would hit FileExistsError on Windows and silently
+            # degrade every same-volume move into a full copy + delete.
+            os.replace(src_file, dst_file)
+        except OSError:
+            # Cross-device move: copy then delete is the only option.
+            shutil.move(src_file, dst_file)
+
+
+def _remove_placeholder(dst_path: str) -> None:
+    """Best-effort removal of a claimed destination after a failed copy."""
+    try:
+        os.remove(dst_path)
+    except OSError:
+        pass
 
 
 # -------------------------
@@ -77,65 +156,234 @@ def adb_list_devices(adb: str) -> list[str]:
     return devices
 
 
-def adb_shell(adb: str, device: str, cmd: str) -> str:
-    p = adb_run([adb, "-s", device, "shell", cmd])
-    if p.returncode != 0:
-        raise RuntimeError(p.stderr.strip() or f"adb shell failed: {cmd}")
-    return p.stdout
+class AdbSession:
+    """A single long-lived `adb shell` for one device.
+
+    Commands are written to the shell's stdin and output is read back up to
+    a sentinel line, so each call costs one pipe round-trip instead of a
+    fresh adb process spawn plus client/server/daemon handshake.
+    """
+
+    _SENTINEL = "__ADB_RC__"
+
+    def __init__(self, adb: str, device: str):
+        self.proc = subprocess.Popen(
+            [adb, "-s", device, "shell"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+
+    def run(self, cmd: str) -> tuple[int, str]:
+        """Run one shell command, returning (exit_code, output)."""
+        if self.proc.poll() is not None:
+            raise RuntimeError("adb shell session is closed")
+        self.proc.stdin.write(f"{cmd}; echo {self._SENTINEL}$?\n")
+        self.proc.stdin.flush()
+
+        lines = []
+        while True:
+            line = self.proc.stdout.readline()
+            if not line:
+                raise RuntimeError("adb shell session ended unexpectedly")
+            stripped = line.rstrip("\r\n")
+            # The sentinel shares a line with the command's tail when the
+            # output did not end in a newline, so search, don't just prefix-match.
+            idx = stripped.find(self._SENTINEL)
+            if idx != -1:
+                if idx > 0:
+                    lines.append(stripped[:idx] + "\n")
+                rc_text = stripped[idx + len(self._SENTINEL):]
+                return (int(rc_text) if rc_text.isdigit() else 1, "".join(lines))
+            lines.append(stripped + "\n")
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+            self.proc.wait()
 
 
-def adb_shell_sh(adb: str, device: str, sh_cmd: str) -> str:
-    return adb_shell(adb, device, f"sh -c '{sh_cmd}'")
+def adb_shell_sh(session: AdbSession, sh_cmd: str) -> str:
+    rc, out = session.run(sh_cmd)
+    if rc != 0:
+        raise RuntimeError(f"adb shell failed (exit {rc}): {sh_cmd}")
+    return out
 
 
 def adb_pull(adb: str, device: str, remote_path: str, local_path: str) -> None:
-    ensure_dir(os.path.dirname(local_path))
+    """Pull one file; the caller must have created local_path's parent."""
     p = adb_run([adb, "-s", device, "pull", remote_path, local_path])
     if p.returncode != 0:
         raise RuntimeError(p.stderr.strip() or f"adb pull failed: {remote_path}")
 
 
-def adb_stat_mtime_epoch(adb: str, device: str, remote_path: str) -> int:
-    rp = remote_path.replace('"', '\\"')
-    out = adb_shell_sh(
-        adb,
-        device,
-        f'toybox stat -c %Y "{rp}" 2>/dev/null || stat -c %Y "{rp}"'
-    ).strip()
-    return int(out)
+def adb_pull_preserving_mtime(adb: str, device: str, remote_path: str,
+                              local_path: str, mtime_epoch: int) -> None:
+    """Pull one file and stamp the device's mtime onto the local copy.
+
+    Plain `adb pull` writes the file with the current time; reusing the
+    epoch from enumeration costs no extra device round-trip.
+    """
+    adb_pull(adb, device, remote_path, local_path)
+    os.utime(local_path, (mtime_epoch, mtime_epoch))
+
+
+def adb_pull_tar_batch(adb: str, device: str, remote_dir: str,
+                       items: list[tuple[str, str, str, int]],
+                       cancel_event: threading.Event | None = None):
+    """Pull many files from one remote directory as a single tar stream.
+
+    items holds (name, rel_path, dst_file, mtime_epoch) tuples whose
+    files are direct children of remote_dir. A single
+    `adb exec-out tar -c` replaces one pull handshake per file, which
+    dominates transfer time for small media like thumbnails and voice
+    notes. Anything the stream did not deliver (tar missing on the
+    device, stream cut short) is retried with a plain per-file pull.
+    cancel_event is honored between tar members and before each
+    fallback pull; skipped items have their placeholders removed.
+    Returns (exported, failed): exported as (rel_path, dst_file,
+    mtime_epoch), failed as (rel_path, dst_file, error message).
+    """
+    def should_cancel() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    by_name = {name: (rel_path, dst_file, mtime_epoch)
+               for name, rel_path, dst_file, mtime_epoch in items}
+    done: set[str] = set()
+    exported = []
+    failed = []
+
+    cmd = "tar -c -C {} {}".format(
+        shlex.quote(remote_dir),
+        " ".join(shlex.quote(name) for name in by_name),
+    )
+    try:
+        p = subprocess.Popen(
+            [adb, "-s", device, "exec-out", cmd],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            with tarfile.open(fileobj=p.stdout, mode="r|") as tf:
+                for member in tf:
+                    if should_cancel():
+                        break
+                    if not member.isfile():
+                        continue
+                    meta = by_name.get(os.path.basename(member.name))
+                    if meta is None:
+                        continue
+                    src = tf.extractfile(member)
+                    if src is None:
+                        continue
+                    rel_path, dst_file, mtime_epoch = meta
+                    with open(dst_file, "wb") as out_f:
+                        shutil.copyfileobj(src, out_f)
+                    os.utime(dst_file, (mtime_epoch, mtime_epoch))
+                    done.add(os.path.basename(member.name))
+                    exported.append((rel_path, dst_file, mtime_epoch))
+        finally:
+            p.stdout.close()
+            p.wait()
+    except Exception:
+        pass  # whatever is missing gets the per-file fallback below
+
+    for name, (rel_path, dst_file, mtime_epoch) in by_name.items():
+        if name in done:
+            continue
+        if should_cancel():
+            _remove_placeholder(dst_file)
+            continue
+        try:
+            adb_pull_preserving_mtime(adb, device, f"{remote_dir}/{name}", dst_file, mtime_epoch)
+            exported.append((rel_path, dst_file, mtime_epoch))
+        except Exception as e:
+            failed.append((rel_path, dst_file, str(e)))
 
+    return exported, failed
 
-def adb_path_exists(adb: str, device: str, remote_path: str) -> bool:
-    rp = remote_path.replace('"', '\\"')
-    out = adb_shell_sh(adb, device, f'ls "{rp}" >/dev/null 2>&1; echo $?').strip()
-    return out.endswith("0")
 
+def adb_path_exists(session: AdbSession, remote_path: str) -> bool:
+    rc, _ = session.run(f'ls {shlex.quote(remote_path)} >/dev/null 2>&1')
+    return rc == 0
 
-def adb_find_whatsapp_media_roots(adb: str, device: str) -> list[str]:
+
+def adb_find_whatsapp_media_roots(session: AdbSession) -> list[str]:
     candidates = [
         "/storage/emulated/0/Android/media/com.whatsapp/WhatsApp/Media",
         "/storage/emulated/0/WhatsApp/Media",
     ]
     roots = []
     for c in candidates:
-        if adb_path_exists(adb, device, c):
+        if adb_path_exists(session, c):
             roots.append(c)
     return roots
 
 
-def adb_find_files(adb: str, device: str, remote_dir: str) -> list[str]:
-    rd = remote_dir.replace('"', '\\"')
-    out = adb_shell_sh(adb, device, f'find "{rd}" -type f 2>/dev/null')
-    return [line.strip() for line in out.splitlines() if line.strip()]
+def adb_find_supports_newermt(session: AdbSession) -> bool:
+    """Probe once whether the device's find accepts -newermt."""
+    rc, _ = session.run('find / -maxdepth 0 -newermt "1970-01-01" >/dev/null 2>&1')
+    return rc == 0
+
+
+def adb_find_files(session: AdbSession, remote_dir: str,
+                   start_date: str | None = None,
+                   end_date_excl: str | None = None) -> list[tuple[int, int, str]]:
+    """List files under remote_dir as (mtime_epoch, size, path) tuples.
+
+    One adb round-trip per folder: `find -printf` emits path, mtime and
+    size together, so no per-file `stat` calls are needed afterwards.
+    When start_date/end_date_excl (YYYY-MM-DD, end exclusive) are given,
+    the date range is applied on the device via -newermt, so
+    out-of-range files never cross the wire at all; only pass them after
+    adb_find_supports_newermt confirms the device understands them.
+    """
+    # shlex.quote survives quotes, $, backticks and spaces in filenames,
+    # all of which naive double-quote escaping breaks on.
+    rd = shlex.quote(remote_dir)
+    pred = ""
+    if start_date and end_date_excl:
+        pred = f' -newermt "{start_date}" ! -newermt "{end_date_excl}"'
+    try:
+        out = adb_shell_sh(
+            session,
+            f'find {rd} -type f{pred} -printf "%T@\\t%s\\t%p\\n" 2>/dev/null'
+        )
+        files = _parse_mtime_listing(out, "\t")
+        # Empty output can also mean -printf is unsupported and the error
+        # was swallowed (old adb does not forward exit codes), so only
+        # trust a non-empty result; otherwise confirm via the fallback.
+        if files:
+            return files
+    except (RuntimeError, ValueError):
+        pass
+
+    # Toybox find may lack -printf; batch stat over the listing instead.
+    out = adb_shell_sh(
+        session,
+        f'find {rd} -type f{pred} -print0 2>/dev/null'
+        f' | xargs -0 -r stat -c "%Y %s %n" 2>/dev/null'
+    )
+    return _parse_mtime_listing(out, " ")
 
 
-def adb_count_files(adb: str, device: str, remote_dir: str) -> int:
-    rd = remote_dir.replace('"', '\\"')
-    out = adb_shell_sh(adb, device, f'find "{rd}" -type f 2>/dev/null | wc -l').strip()
-    try:
-        return int(out)
-    except Exception:
-        return 0
+def _parse_mtime_listing(out: str, sep: str) -> list[tuple[int, int, str]]:
+    files = []
+    for line in out.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        ts, size, path = line.split(sep, 2)
+        files.append((int(float(ts)), int(size), path))
+    return files
 
 
 class App(tk.Tk):
@@ -149,7 +397,10 @@ class App(tk.Tk):
 
         # Threading / communication
         self._worker_thread = None
-        self._ui_queue: "queue.Queue[tuple]" = queue.Queue()
+        # deque.append/popleft are each atomic under the GIL, which is all
+        # this single-producer/single-consumer pattern needs — no Queue
+        # lock/condition signalling per event.
+        self._ui_queue: "collections.deque[tuple]" = collections.deque()
         self._cancel_event = threading.Event()
 
         # State counters
@@ -168,12 +419,18 @@ class App(tk.Tk):
         self.var_start = tk.StringVar(value="2025-09-17")
         self.var_end = tk.StringVar(value="2025-12-17")
         self.var_mode = tk.StringVar(value="copy")
+        self.var_log_verbose = tk.BooleanVar(value=False)
+        self._log_verbose = False  # plain-bool snapshot workers can read
 
         self.subfolder_vars = {name: tk.BooleanVar(value=True) for name in DEFAULT_SUBFOLDERS}
 
         self._build_ui()
 
-        self.after(100, self._process_ui_queue)
+        # Workers push <<WorkerEvent>> when they flush a batch; the short
+        # timer is the fallback for platforms where cross-thread
+        # event_generate is unreliable.
+        self.bind("<<WorkerEvent>>", self._on_worker_event)
+        self.after(15, self._process_ui_queue)
 
         self._refresh_devices()
 
@@ -311,6 +568,12 @@ class App(tk.Tk):
         self.btn_cancel = ttk.Button(frm_controls, text="Cancel", command=self._on_cancel, state="disabled")
         self.btn_cancel.pack(side="left")
 
+        ttk.Checkbutton(
+            frm_controls,
+            text="Verbose log (one line per exported file)",
+            variable=self.var_log_verbose,
+        ).pack(side="left", padx=(20, 0))
+
         # Progress
         frm_progress = ttk.LabelFrame(self, text="Progress")
         frm_progress.pack(fill="x", **pad)
@@ -453,6 +716,7 @@ class App(tk.Tk):
             return
 
         self._cancel_event.clear()
+        self._log_verbose = bool(self.var_log_verbose.get())
         self._scanned = 0
         self._matched = 0
         self._errors = 0
@@ -478,207 +742,437 @@ class App(tk.Tk):
             else:
                 self._worker_local(source_root=src_value, dest_root=dest_root, start_dt=start_dt, end_dt=end_dt, subfolders=subfolders, mode=mode)
         finally:
-            self._ui_queue.put(("done", None))
+            self._ui_queue.append(("done", None))
+            self._notify_ui()
 
     def _worker_adb(self, device: str, dest_root: str, start_dt: datetime, end_dt: datetime, subfolders: list[str]):
+        session = None
+        # Pre-bind hot attributes: every name below is hit once or twice per
+        # file, and a local beats an attribute lookup in the tight loops.
+        put = self._ui_queue.append
+        cancelled = self._cancel_event.is_set
+        join = os.path.join
+        # Compare raw epoch seconds in the hot loop; datetime objects are
+        # only built for the files that actually get exported.
+        start_ts = start_dt.timestamp()
+        end_ts = end_dt.timestamp()
         try:
-            roots = adb_find_whatsapp_media_roots(self.adb, device)
+            session = AdbSession(self.adb, device)
+            roots = adb_find_whatsapp_media_roots(session)
             if not roots:
-                self._ui_queue.put(("log", "ERROR: Could not find WhatsApp Media folder on the device."))
-                self._ui_queue.put(("log", "Tried: /storage/emulated/0/Android/media/com.whatsapp/WhatsApp/Media and /storage/emulated/0/WhatsApp/Media"))
+                put(("log", "ERROR: Could not find WhatsApp Media folder on the device."))
+                put(("log", "Tried: /storage/emulated/0/Android/media/com.whatsapp/WhatsApp/Media and /storage/emulated/0/WhatsApp/Media"))
                 return
 
-            self._ui_queue.put(("log", f"Using WhatsApp Media root(s): {', '.join(roots)}"))
-
-            total = 0
-            for root in roots:
-                for sub in subfolders:
-                    remote_dir = f"{root}/{sub}"
-                    if adb_path_exists(self.adb, device, remote_dir):
-                        total += adb_count_files(self.adb, device, remote_dir)
-
-            if total > 0:
-                self._ui_queue.put(("progress_setup", total))
-                self._ui_queue.put(("log", f"Estimated total files to scan: {total}"))
+            put(("log", f"Using WhatsApp Media root(s): {', '.join(roots)}"))
+
+            # Enumerate every folder once up front: the cached listings serve
+            # both the progress estimate and the scan loop, instead of a
+            # separate exists+count round-trip per folder followed by a
+            # second find.
+            # Prune the date range on the device when its find supports
+            # -newermt; the Python-side range check below stays as a safety net.
+            prune_start = prune_end = None
+            if adb_find_supports_newermt(session):
+                # Widen by a day on each side: -newermt runs in the device's
+                # timezone, which may differ from this PC's; the exact range
+                # check below trims the excess.
+                prune_start = (start_dt - timedelta(days=1)).strftime(DATE_FMT)
+                prune_end = (end_dt + timedelta(days=2)).strftime(DATE_FMT)
             else:
-                self._ui_queue.put(("progress_indeterminate", None))
-                self._ui_queue.put(("log", "Scanning... (progress is indeterminate)"))
+                put(("log", "Device find lacks -newermt; filtering dates on the PC side."))
 
+            listings: list[tuple[str, list[tuple[int, int, str]]]] = []
+            total = 0
             for root in roots:
-                if self._cancel_event.is_set():
+                if cancelled():
                     break
 
                 for sub in subfolders:
-                    if self._cancel_event.is_set():
+                    if cancelled():
                         break
 
                     remote_dir = f"{root}/{sub}"
-                    if not adb_path_exists(self.adb, device, remote_dir):
-                        self._ui_queue.put(("log", f"Skipping missing folder: {remote_dir}"))
+                    if not adb_path_exists(session, remote_dir):
+                        put(("log", f"Skipping missing folder: {remote_dir}"))
                         continue
 
                     try:
-                        remote_files = adb_find_files(self.adb, device, remote_dir)
+                        remote_files = adb_find_files(session, remote_dir, prune_start, prune_end)
                     except Exception as e:
                         self._errors += 1
-                        self._ui_queue.put(("errors", self._errors))
-                        self._ui_queue.put(("log", f"ERROR listing files in: {remote_dir} ({e})"))
+                        put(("errors", self._errors))
+                        put(("log", f"ERROR listing files in: {remote_dir} ({e})"))
                         continue
 
-                    for remote_file in remote_files:
-                        if self._cancel_event.is_set():
+                    listings.append((root, remote_files))
+                    total += len(remote_files)
+
+            # The scan over the cached listings is an in-memory walk that
+            # finishes in moments; the bar stays indeterminate through it and
+            # then tracks the actual transfers, like Local Folder mode.
+            put(("progress_indeterminate", None))
+            if total > 0:
+                put(("log", f"Estimated total files to scan: {total}"))
+            else:
+                put(("log", "Scanning... (progress is indeterminate)"))
+
+            # Matched files are grouped by their remote parent directory and
+            # pulled as bounded tar streams on a pool, so many small files
+            # share one adb handshake instead of paying one each.
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+            batch_futures: dict[concurrent.futures.Future, list[tuple[str, str, str, int]]] = {}
+            batch_items: dict[str, list[tuple[str, str, str, int]]] = {}
+            batch_bytes: dict[str, int] = {}
+            known_dirs: set[str] = set()
+            pending_ticks = 0
+
+            def submit_batch(parent: str):
+                items = batch_items.pop(parent)
+                batch_bytes.pop(parent, None)
+                fut = pool.submit(adb_pull_tar_batch, self.adb, device, parent, items,
+                                  self._cancel_event)
+                batch_futures[fut] = items
+
+            try:
+                for root, remote_files in listings:
+                    if cancelled():
+                        break
+
+                    prefix = root.rstrip("/") + "/"
+                    for mtime_epoch, size, remote_file in remote_files:
+                        if cancelled():
                             break
 
                         self._scanned += 1
-                        self._ui_queue.put(("scanned", self._scanned))
-                        self._ui_queue.put(("progress_tick", 1))
+                        pending_ticks += 1
+                        if pending_ticks >= SCAN_FLUSH_EVERY:
+                            put(("scanned", self._scanned))
+                            pending_ticks = 0
+                            self._notify_ui()
+
+                        if not (start_ts <= mtime_epoch <= end_ts):
+                            continue
 
+                        rel_path = remote_file.removeprefix(prefix) if remote_file.startswith(prefix) else os.path.basename(remote_file)
                         try:
-                            mtime_epoch = adb_stat_mtime_epoch(self.adb, device, remote_file)
-                            mtime = datetime.fromtimestamp(mtime_epoch)
+                            dst_file = join(dest_root, rel_path)
+                            # A handful of unique dirs serve thousands of files;
+                            # only hit the filesystem for ones not seen yet.
+                            # (Claims happen serially on this thread, so a
+                            # plain set is enough.)
+                            dst_dir = os.path.dirname(dst_file)
+                            if dst_dir not in known_dirs:
+                                os.makedirs(dst_dir, exist_ok=True)
+                                known_dirs.add(dst_dir)
+                            dst_file = unique_destination_path(dst_file)
                         except Exception as e:
                             self._errors += 1
-                            self._ui_queue.put(("errors", self._errors))
-                            self._ui_queue.put(("log", f"ERROR reading time: {remote_file} ({e})"))
-                            continue
-
-                        if not (start_dt <= mtime <= end_dt):
+                            put(("errors", self._errors))
+                            put(("log", f"ERROR exporting: {rel_path} ({e})"))
                             continue
 
-                        prefix = root.rstrip("/") + "/"
-                        rel_path = remote_file[len(prefix):] if remote_file.startswith(prefix) else os.path.basename(remote_file)
-                        dst_file = unique_destination_path(os.path.join(dest_root, rel_path))
+                        remote_parent, _, remote_name = remote_file.rpartition("/")
+                        batch_items.setdefault(remote_parent, []).append(
+                            (remote_name, rel_path, dst_file, mtime_epoch))
+                        batch_bytes[remote_parent] = batch_bytes.get(remote_parent, 0) + size
+                        if (len(batch_items[remote_parent]) >= TAR_BATCH_MAX_FILES
+                                or batch_bytes[remote_parent] >= TAR_BATCH_MAX_BYTES):
+                            submit_batch(remote_parent)
+
+                if not cancelled():
+                    for parent in list(batch_items):
+                        submit_batch(parent)
+                else:
+                    # Scan was cancelled: release the destinations claimed
+                    # for batches that never got submitted.
+                    for items in batch_items.values():
+                        for _, _, dst_file, _ in items:
+                            _remove_placeholder(dst_file)
+                    batch_items.clear()
+                    batch_bytes.clear()
+
+                if pending_ticks:
+                    put(("scanned", self._scanned))
+                    pending_ticks = 0
+                    self._notify_ui()
+
+                # Size the bar by the matched count and tick per transferred
+                # file below, so it tracks the transfer phase, not the scan.
+                matched_total = sum(len(items) for items in batch_futures.values())
+                if matched_total:
+                    put(("progress_setup", matched_total))
+                put(("log", f"{matched_total} of {self._scanned} scanned files fall in the date range."))
+
+                for fut in concurrent.futures.as_completed(batch_futures):
+                    if cancelled():
+                        for pending in batch_futures:
+                            pending.cancel()
+                    if fut.cancelled():
+                        for _, _, dst_file, _ in batch_futures[fut]:
+                            _remove_placeholder(dst_file)
+                        continue
 
-                        try:
-                            adb_pull(self.adb, device, remote_file, dst_file)
-                            self._matched += 1
-                            self._ui_queue.put(("matched", self._matched))
-                            self._ui_queue.put(("log", f"Exported: {rel_path}  (modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')})"))
-                        except Exception as e:
+                    try:
+                        exported, failed = fut.result()
+                    except Exception as e:
+                        for _, rel_path, dst_file, _ in batch_futures[fut]:
                             self._errors += 1
-                            self._ui_queue.put(("errors", self._errors))
-                            self._ui_queue.put(("log", f"ERROR exporting: {rel_path} ({e})"))
+                            put(("errors", self._errors))
+                            put(("log", f"ERROR exporting: {rel_path} ({e})"))
+                            _remove_placeholder(dst_file)
+                        put(("progress_tick", len(batch_futures[fut])))
+                        continue
+
+                    for rel_path, dst_file, mtime_epoch in exported:
+                        self._matched += 1
+                        put(("matched", self._matched))
+                        if self._log_verbose:
+                            mtime_text = datetime.fromtimestamp(mtime_epoch).strftime("%Y-%m-%d %H:%M:%S")
+                            put(("log", f"Exported: {rel_path}  (modified: {mtime_text})"))
+                        elif self._matched % EXPORT_SUMMARY_EVERY == 0:
+                            put(("log", f"Exported {self._matched} files so far (last: {rel_path})"))
 
-            self._ui_queue.put(("log", "Cancelled by user." if self._cancel_event.is_set() else "Export complete (ADB mode)."))
+                    for rel_path, dst_file, err in failed:
+                        self._errors += 1
+                        put(("errors", self._errors))
+                        put(("log", f"ERROR exporting: {rel_path} ({err})"))
+                        _remove_placeholder(dst_file)
+
+                    put(("progress_tick", len(exported) + len(failed)))
+                    self._notify_ui()
+            finally:
+                pool.shutdown(wait=True)
+
+            put(("log", "Cancelled by user." if cancelled() else "Export complete (ADB mode)."))
 
         except Exception as e:
             self._errors += 1
-            self._ui_queue.put(("errors", self._errors))
-            self._ui_queue.put(("log", f"FATAL (ADB mode): {e}"))
-
-    def _estimate_total_files_local(self, media_root: str, subfolders: list[str]) -> int:
-        total = 0
-        for sub in subfolders:
-            p = os.path.join(media_root, sub)
-            if not os.path.isdir(p):
-                continue
-            for _, _, files in os.walk(p):
-                total += len(files)
-                if total > 500000:
-                    return total
-        return total
+            put(("errors", self._errors))
+            put(("log", f"FATAL (ADB mode): {e}"))
+        finally:
+            if session is not None:
+                session.close()
 
     def _worker_local(self, source_root: str, dest_root: str, start_dt: datetime, end_dt: datetime,
                       subfolders: list[str], mode: str):
+        # Pre-bind hot attributes: a local beats an attribute lookup in the
+        # per-file loops below.
+        put = self._ui_queue.append
+        cancelled = self._cancel_event.is_set
+        join = os.path.join
         try:
             media_root = detect_media_root(source_root)
-            self._ui_queue.put(("log", f"Media root detected: {media_root}"))
-
-            total = self._estimate_total_files_local(media_root, subfolders)
-            if total > 0:
-                self._ui_queue.put(("progress_setup", total))
-                self._ui_queue.put(("log", f"Estimated total files to scan: {total}"))
-            else:
-                self._ui_queue.put(("progress_indeterminate", None))
-                self._ui_queue.put(("log", "Scanning... (progress is indeterminate)"))
-
+            put(("log", f"Media root detected: {media_root}"))
+
+            # Raw epoch compares in the hot loop; datetimes only for log lines.
+            start_ts = start_dt.timestamp()
+            end_ts = end_dt.timestamp()
+
+            # One tree pass serves both the scan and the progress estimate:
+            # the bar is indeterminate while scanning, then determinate over
+            # the matched copies. (The old pre-count walked everything twice.)
+            put(("progress_indeterminate", None))
+            put(("log", "Scanning... (progress is indeterminate)"))
+
+            # Scan pass: collect candidates into parallel arrays (SoA) so the
+            # date filter runs over contiguous memory instead of branching
+            # per file inside the walk.
+            paths: list[str] = []
+            mtimes = array.array("d")
+            add_path = paths.append
+            add_mtime = mtimes.append
+            pending_ticks = 0
             for sub in subfolders:
-                if self._cancel_event.is_set():
+                if cancelled():
                     break
 
                 src_dir = os.path.join(media_root, sub)
                 if not os.path.isdir(src_dir):
-                    self._ui_queue.put(("log", f"Skipping missing folder: {src_dir}"))
+                    put(("log", f"Skipping missing folder: {src_dir}"))
                     continue
 
-                for root, _, files in os.walk(src_dir):
-                    if self._cancel_event.is_set():
+                for entry in scandir_files(src_dir):
+                    if cancelled():
                         break
 
-                    for name in files:
-                        if self._cancel_event.is_set():
-                            break
+                    self._scanned += 1
+                    pending_ticks += 1
+                    if pending_ticks >= SCAN_FLUSH_EVERY:
+                        put(("scanned", self._scanned))
+                        pending_ticks = 0
+                        self._notify_ui()
 
-                        src_file = os.path.join(root, name)
+                    try:
+                        st_mtime = entry.stat().st_mtime
+                    except Exception as e:
+                        self._errors += 1
+                        put(("errors", self._errors))
+                        put(("log", f"ERROR reading time: {entry.path} ({e})"))
+                        continue
 
-                        self._scanned += 1
-                        self._ui_queue.put(("scanned", self._scanned))
-                        self._ui_queue.put(("progress_tick", 1))
+                    add_path(entry.path)
+                    add_mtime(st_mtime)
 
-                        try:
-                            mtime = datetime.fromtimestamp(os.path.getmtime(src_file))
-                        except Exception as e:
-                            self._errors += 1
-                            self._ui_queue.put(("errors", self._errors))
-                            self._ui_queue.put(("log", f"ERROR reading time: {src_file} ({e})"))
-                            continue
+            if pending_ticks:
+                put(("scanned", self._scanned))
+                pending_ticks = 0
+                self._notify_ui()
 
-                        if not (start_dt <= mtime <= end_dt):
-                            continue
+            # Filter pass: one vectorized comparison when NumPy is around,
+            # plain Python otherwise.
+            if numpy is not None:
+                mt = numpy.frombuffer(mtimes, dtype=numpy.float64)
+                mask = (mt >= start_ts) & (mt <= end_ts)
+                selected = numpy.nonzero(mask)[0].tolist()
+            else:
+                selected = [i for i, ts in enumerate(mtimes) if start_ts <= ts <= end_ts]
+
+            if selected:
+                put(("progress_setup", len(selected)))
+            put(("log", f"{len(selected)} of {len(paths)} scanned files fall in the date range."))
+
+            # Copy pass over the matches only. copyfile/sendfile release the
+            # GIL, so a pool gets real parallelism on NVMe and SMB mounts;
+            # destination dirs are claimed serially before submitting.
+            pool = concurrent.futures.ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 4) * 2))
+            copy_futures: dict[concurrent.futures.Future, tuple[str, str, float]] = {}
+            known_dirs: set[str] = set()
+            try:
+                for i in selected:
+                    if cancelled():
+                        break
 
-                        rel_path = os.path.relpath(src_file, media_root)
-                        dst_file = unique_destination_path(os.path.join(dest_root, rel_path))
+                    src_file = paths[i]
+                    mtime_ts = mtimes[i]
+                    rel_path = os.path.relpath(src_file, media_root)
 
-                        try:
-                            ensure_dir(os.path.dirname(dst_file))
-                            if mode == "copy":
-                                shutil.copy2(src_file, dst_file)
-                            else:
-                                shutil.move(src_file, dst_file)
-
-                            self._matched += 1
-                            self._ui_queue.put(("matched", self._matched))
-                            self._ui_queue.put(("log", f"Exported: {rel_path}  (modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')})"))
-                        except Exception as e:
-                            self._errors += 1
-                            self._ui_queue.put(("errors", self._errors))
-                            self._ui_queue.put(("log", f"ERROR exporting: {rel_path} ({e})"))
+                    try:
+                        # Claims happen serially on this thread, so a plain
+                        # set is enough to skip repeat makedirs calls.
+                        dst_file = join(dest_root, rel_path)
+                        dst_dir = os.path.dirname(dst_file)
+                        if dst_dir not in known_dirs:
+                            os.makedirs(dst_dir, exist_ok=True)
+                            known_dirs.add(dst_dir)
+                        dst_file = unique_destination_path(dst_file)
+                    except Exception as e:
+                        self._errors += 1
+                        put(("errors", self._errors))
+                        put(("log", f"ERROR exporting: {rel_path} ({e})"))
+                        continue
 
-            self._ui_queue.put(("log", "Cancelled by user." if self._cancel_event.is_set() else "Export complete (Local Folder mode)."))
+                    fut = pool.submit(copy_local_file, src_file, dst_file, mtime_ts, mode)
+                    copy_futures[fut] = (rel_path, dst_file, mtime_ts)
+
+                for fut in concurrent.futures.as_completed(copy_futures):
+                    if cancelled():
+                        for pending in copy_futures:
+                            pending.cancel()
+                    if fut.cancelled():
+                        _remove_placeholder(copy_futures[fut][1])
+                        continue
+
+                    rel_path, dst_file, mtime_ts = copy_futures[fut]
+                    put(("progress_tick", 1))
+                    try:
+                        fut.result()
+                        self._matched += 1
+                        put(("matched", self._matched))
+                        if self._log_verbose:
+                            mtime_text = datetime.fromtimestamp(mtime_ts).strftime("%Y-%m-%d %H:%M:%S")
+                            put(("log", f"Exported: {rel_path}  (modified: {mtime_text})"))
+                        elif self._matched % EXPORT_SUMMARY_EVERY == 0:
+                            put(("log", f"Exported {self._matched} files so far (last: {rel_path})"))
+                    except Exception as e:
+                        self._errors += 1
+                        put(("errors", self._errors))
+                        put(("log", f"ERROR exporting: {rel_path} ({e})"))
+                        _remove_placeholder(dst_file)
+            finally:
+                pool.shutdown(wait=True)
+
+            put(("log", "Cancelled by user." if cancelled() else "Export complete (Local Folder mode)."))
 
         except Exception as e:
             self._errors += 1
-            self._ui_queue.put(("errors", self._errors))
-            self._ui_queue.put(("log", f"FATAL (Local mode): {e}"))
+            put(("errors", self._errors))
+            put(("log", f"FATAL (Local mode): {e}"))
 
     # ---------------- UI queue handling ----------------
 
     def _process_ui_queue(self):
+        self._drain_ui_queue()
+        self.after(15, self._process_ui_queue)
+
+    def _on_worker_event(self, _event):
+        self._drain_ui_queue()
+
+    def _notify_ui(self):
+        """Nudge the Tk thread to drain the queue without waiting for the timer.
+
+        Called from worker threads; event_generate is Tcl thread-safe on
+        most platforms, and where it is not the periodic timer still drains.
+        """
         try:
-            while True:
-                item = self._ui_queue.get_nowait()
-                self._handle_ui_event(item)
-        except queue.Empty:
+            self.event_generate("<<WorkerEvent>>", when="tail")
+        except Exception:
             pass
-        self.after(100, self._process_ui_queue)
+
+    def _drain_ui_queue(self):
+        events = []
+        ui_queue = self._ui_queue
+        while ui_queue:
+            events.append(ui_queue.popleft())
+        if events:
+            self._apply_ui_events(events)
+
+    def _apply_ui_events(self, events: list[tuple]):
+        # Coalesce counter/progress updates so each widget is touched at
+        # most once per drain instead of once per file, and batch log lines
+        # into a single Text insert.
+        scanned = matched = errors = None
+        ticks = 0
+        log_buf = []
+        ts = time.strftime("%H:%M:%S")
+        for kind, payload in events:
+            if kind == "log":
+                log_buf.append(f"[{ts}] {payload}\n")
+            elif kind == "scanned":
+                scanned = payload
+            elif kind == "matched":
+                matched = payload
+            elif kind == "errors":
+                errors = payload
+            elif kind == "progress_tick":
+                ticks += int(payload)
+            else:
+                # Rare structural events ("done", progress mode changes) may
+                # log themselves; flush first to keep line order.
+                if log_buf:
+                    self._append_log_text("".join(log_buf))
+                    log_buf = []
+                self._handle_ui_event((kind, payload))
+
+        if log_buf:
+            self._append_log_text("".join(log_buf))
+
+        if scanned is not None:
+            self.lbl_scanned.configure(text=f"Scanned: {scanned}")
+        if matched is not None:
+            self.lbl_matched.configure(text=f"Exported: {matched}")
+        if errors is not None:
+            self.lbl_errors.configure(text=f"Errors: {errors}")
+        if ticks and str(self.progress["mode"]) == "determinate":
+            self.progress["value"] = min(self.progress["value"] + ticks, self.progress["maximum"])
 
     def _handle_ui_event(self, item: tuple):
         kind, payload = item
 
-        if kind == "log":
-            self._log(str(payload))
-        elif kind == "scanned":
-            self.lbl_scanned.configure(text=f"Scanned: {payload}")
-        elif kind == "matched":
-            self.lbl_matched.configure(text=f"Exported: {payload}")
-        elif kind == "errors":
-            self.lbl_errors.configure(text=f"Errors: {payload}")
-        elif kind == "progress_setup":
+        if kind == "progress_setup":
             total = int(payload)
+            self.progress.stop()  # may arrive while the indeterminate scan animation runs
             self.progress.configure(mode="determinate", maximum=max(total, 1), value=0)
-        elif kind == "progress_tick":
-            if str(self.progress["mode"]) == "determinate":
-                self.progress["value"] = min(self.progress["value"] + int(payload), self.progress["maximum"])
         elif kind == "progress_indeterminate":
             self.progress.configure(mode="indeterminate")
             self.progress.start(10)
@@ -695,7 +1189,12 @@ class App(tk.Tk):
 
     def _log(self, msg: str):
         ts = time.strftime("%H:%M:%S")
-        self.txt_log.insert("end", f"[{ts}] {msg}\n")
+        self._append_log_text(f"[{ts}] {msg}\n")
+
+    def _append_log_text(self, text: str):
+        """One insert + one trim + one scroll, however many lines arrived."""
+        self.txt_log.insert("end", text)
+        self.txt_log.delete("1.0", f"end - {MAX_LOG_LINES} lines")
         self.txt_log.see("end")
 
 